@@ -1,56 +1,99 @@
 import streamlit as st
 from utils.sql_loader import load_sql_files
-from utils.function_parser import parse_function_metadata
-from utils.procedure_parser import parse_procedure_metadata
+from utils.function_parser import get_all_function_metadata
+from utils.procedure_parser import get_all_procedure_metadata
 from utils.function_ui_helpers import render_input_widget, build_function_call
 from utils.procedure_ui_helpers import build_procedure_call
-from db.executor import run_query, run_procedure, run_function
+from utils.param_types import ParamType, param_type_code
+from db.connection import reset_session_connection
+from db.executor import (
+    PAGE_SIZE,
+    cached_run_query,
+    cached_run_function,
+    cached_run_function_scalar,
+    render_sql,
+    run_procedure,
+)
 
 st.set_page_config(page_title="Postgres UI", layout="wide")
 
-# Custom CSS for larger font size
-st.markdown(
-    """
-    <style>
-    /* Global font size for dataframes */
-    .stDataFrame div[data-testid="stTable"] {
-        font-size: 20px !important;
-    }
-    
-    /* Fallback for HTML tables if used */
-    table {
-        font-size: 20px !important;
-    }
-    </style>
-""",
-    unsafe_allow_html=True,
-)
+# Result grids taller than this many rows get a fixed-height viewport
+RESULTS_AUTO_HEIGHT_ROWS = 15
+RESULTS_HEIGHT = 600
 
+# Function return kinds shown as a single metric; anything else (TABLE,
+# SETOF, JSON, arrays, ...) is rendered as a table
+SCALAR_RETURN_KINDS = frozenset(
+    {ParamType.INT, ParamType.DECIMAL, ParamType.TEXT, ParamType.BOOL}
+)
 
-def display_results(df):
-    """Helper to display results with large font."""
-    if df is not None and not df.empty:
-        st.dataframe(df, use_container_width=True)
+def display_results(data):
+    """Helper to display a pyarrow.Table or pandas.DataFrame without styling."""
+    if data is not None and len(data) > 0:
+        # pyarrow.Table exposes column_names; DataFrame exposes columns
+        columns = getattr(data, "column_names", None) or list(data.columns)
+        options = {}
+        if len(data) > RESULTS_AUTO_HEIGHT_ROWS:
+            # Fixed-height viewport: the grid only lays out visible rows
+            options["height"] = RESULTS_HEIGHT
+        st.dataframe(
+            data,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                name: st.column_config.Column(width="medium") for name in columns
+            },
+            **options,
+        )
     else:
         st.info("No results found.")
 
 
 st.title("PostgreSQL Functions, Procedures & Queries")
 
+# Query/function results are cached; let the user force a fresh read
+if st.sidebar.button(
+    "🔄 Refresh Data", help="Clear cached results and re-read SQL metadata"
+):
+    cached_run_query.clear()
+    cached_run_function.clear()
+    cached_run_function_scalar.clear()
+    st.session_state.pop("func_src", None)
+    st.session_state.pop("proc_src", None)
+
+# Drop the cached connection, e.g. after the database was restarted
+if st.sidebar.button("🔌 Reconnect", help="Open a new database connection"):
+    reset_session_connection()
+
 # Load SQL files
 queries = load_sql_files("queries")
 functions = load_sql_files("functions")
 procedures = load_sql_files("procedures")
 
+# Re-parse metadata only when the loaded files changed; load_sql_files
+# returns the same dict object until a file is added, removed or modified
+if st.session_state.get("func_src") is not functions:
+    st.session_state["func_meta"] = get_all_function_metadata(functions)
+    st.session_state["func_src"] = functions
+if st.session_state.get("proc_src") is not procedures:
+    st.session_state["proc_meta"] = get_all_procedure_metadata(procedures)
+    st.session_state["proc_src"] = procedures
+
 tab1, tab2, tab3 = st.tabs(["Queries", "Functions", "Procedures"])
 
 # ------------------ QUERIES ------------------
-with tab1:
+@st.fragment
+def render_queries_tab():
     st.header("Saved Queries")
 
     selected = st.selectbox("Choose Query", list(queries.keys()))
 
     if st.button("Run Query"):
+        # Remember the query so paging reruns keep showing its results
+        st.session_state["query_run"] = selected
+        st.session_state["query_page"] = 1
+
+    if st.session_state.get("query_run") == selected:
         try:
             sql = queries[selected]
             
@@ -58,12 +101,22 @@ with tab1:
             with st.expander("🔍 View SQL Query"):
                 st.code(sql, language="sql")
             
-            # Execute query
+            page = st.number_input(
+                "Page",
+                min_value=1,
+                step=1,
+                key="query_page",
+                help=f"Results are fetched {PAGE_SIZE} rows at a time",
+            )
+            
+            # Execute query (only the selected page is fetched)
             with st.spinner("Executing query..."):
-                df = run_query(sql)
+                df = cached_run_query(sql, offset=(page - 1) * PAGE_SIZE)
             
             # Display results
-            st.success(f"✅ Query executed successfully! ({len(df)} rows returned)")
+            st.success(
+                f"✅ Query executed successfully! ({len(df)} rows returned on page {page})"
+            )
             display_results(df)
             
         except ValueError as ve:
@@ -81,7 +134,8 @@ with tab1:
             )
 
 # ------------------ FUNCTIONS ------------------
-with tab2:
+@st.fragment
+def render_functions_tab():
     st.header("Database Functions")
 
     if not functions:
@@ -95,9 +149,8 @@ with tab2:
         )
 
         if selected_func:
-            # Get SQL content and parse metadata
-            func_sql = functions[selected_func]
-            metadata = parse_function_metadata(func_sql)
+            # Look up pre-parsed metadata
+            metadata = st.session_state["func_meta"].get(selected_func)
 
             if not metadata:
                 st.error(
@@ -124,7 +177,7 @@ with tab2:
 
                         # Render appropriate input widget
                         params_dict[param_name] = render_input_widget(
-                            param_name, param_type
+                            param_name, param_type, param["type_code"]
                         )
                 else:
                     st.info("ℹ️ This function takes no parameters.")
@@ -140,20 +193,31 @@ with tab2:
                     try:
                         # Build SQL call
                         return_type = metadata.get("returns", "DECIMAL")
-                        sql_call = build_function_call(
+                        sql_call, call_params = build_function_call(
                             metadata["name"], params_dict, return_type
                         )
 
                         # Show the SQL being executed
                         with st.expander("🔍 View SQL Query"):
-                            st.code(sql_call, language="sql")
+                            st.code(render_sql(sql_call, call_params), language="sql")
 
-                        # Execute function
+                        # Execute function; scalar return types yield one value
+                        is_scalar = param_type_code(return_type) in SCALAR_RETURN_KINDS
                         with st.spinner("Executing function..."):
-                            df = run_function(sql_call)
+                            if is_scalar:
+                                value = cached_run_function_scalar(
+                                    sql_call, tuple(call_params)
+                                )
+                            else:
+                                df = cached_run_function(sql_call, tuple(call_params))
 
                         # Display results
-                        display_results(df)
+                        if is_scalar:
+                            st.metric(
+                                metadata["name"], "NULL" if value is None else str(value)
+                            )
+                        else:
+                            display_results(df)
 
                     except ValueError as ve:
                         st.error(f"❌ **Validation Error:** {ve}")
@@ -168,7 +232,8 @@ with tab2:
 
 
 # ------------------ PROCEDURES ------------------
-with tab3:
+@st.fragment
+def render_procedures_tab():
     st.header("Stored Procedures")
 
     if not procedures:
@@ -182,9 +247,8 @@ with tab3:
         )
 
         if selected_proc:
-            # Get SQL content and parse metadata
-            proc_sql = procedures[selected_proc]
-            metadata = parse_procedure_metadata(proc_sql)
+            # Look up pre-parsed metadata
+            metadata = st.session_state["proc_meta"].get(selected_proc)
 
             if not metadata:
                 st.error(
@@ -201,14 +265,15 @@ with tab3:
                 # Dynamic input fields based on parameters
                 params_dict = {}
 
-                if metadata.get("params"):
+                if metadata["param_names"]:
                     st.subheader("📝 Procedure Parameters")
 
                     # Create input widgets for each parameter
-                    for param in metadata["params"]:
-                        param_name = param["name"]
-                        param_type = param["type"]
-
+                    for param_name, param_type, type_code in zip(
+                        metadata["param_names"],
+                        metadata["param_types"],
+                        metadata["param_type_codes"],
+                    ):
                         # Handle JSON type specially
                         if param_type == "JSON":
                             params_dict[param_name] = st.text_area(
@@ -219,7 +284,7 @@ with tab3:
                         else:
                             # Reuse existing input widget renderer from functions
                             params_dict[param_name] = render_input_widget(
-                                param_name, param_type
+                                param_name, param_type, type_code
                             )
                 else:
                     st.info("ℹ️ This procedure takes no parameters.")
@@ -236,15 +301,22 @@ with tab3:
                 if execute_btn:
                     try:
                         # Build CALL statement
-                        call_stmt = build_procedure_call(metadata["name"], params_dict)
+                        call_stmt, call_params = build_procedure_call(
+                            metadata["name"], params_dict
+                        )
 
                         # Show the SQL being executed
                         with st.expander("🔍 View SQL Statement"):
-                            st.code(call_stmt, language="sql")
+                            st.code(render_sql(call_stmt, call_params), language="sql")
 
                         # Execute procedure
                         with st.spinner("Executing procedure..."):
-                            result = run_procedure(call_stmt)
+                            result = run_procedure(call_stmt, call_params)
+
+                        # Procedures change data, so cached results are stale
+                        cached_run_query.clear()
+                        cached_run_function.clear()
+                        cached_run_function_scalar.clear()
 
                         # Display success
                         st.success("✅ Procedure executed successfully!")
@@ -265,3 +337,14 @@ with tab3:
                         st.info(
                             "💡 **Tip:** Make sure the procedure is created in the database. Run the SQL files in database/procedures/ first."
                         )
+
+
+# Each tab is a fragment, so interacting with one tab only reruns that tab
+with tab1:
+    render_queries_tab()
+
+with tab2:
+    render_functions_tab()
+
+with tab3:
+    render_procedures_tab()
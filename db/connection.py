@@ -1,9 +1,22 @@
-import psycopg2
 import os
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# psycopg2 connections must not run concurrent transactions. There is a
+# single shared connection, so sessions queue behind each other's queries;
+# fine for this app's handful of users and short statements.
+_connection_lock = threading.Lock()
+
+# Process-wide connection shared by all sessions; guarded by _connection_lock
+_session_conn = None
+
+
 def get_connection():
     return psycopg2.connect(
         host=os.getenv("DB_HOST"),
@@ -12,3 +25,40 @@ def get_connection():
         user=os.getenv("DB_USER"),
         password=os.getenv("DB_PASSWORD")
     )
+
+
+def reset_session_connection():
+    """Close the shared connection so the next borrow() opens a new one."""
+    global _session_conn
+    with _connection_lock:
+        if _session_conn is not None:
+            _session_conn.close()
+            _session_conn = None
+
+
+@contextmanager
+def borrow():
+    """
+    Hold the shared connection for the duration of a with-block.
+
+    One long-lived connection avoids reconnecting per query and keeps its
+    plan caches warm. It is opened on first use, access is serialized, a
+    connection found closed (e.g. after a server restart) is replaced, and
+    any transaction left open is rolled back so the next caller starts
+    clean.
+    """
+    global _session_conn
+    with _connection_lock:
+        if _session_conn is None or _session_conn.closed:
+            _session_conn = get_connection()
+        conn = _session_conn
+
+        try:
+            yield conn
+        finally:
+            if (
+                not conn.closed
+                and conn.info.transaction_status
+                != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            ):
+                conn.rollback()
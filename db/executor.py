@@ -1,131 +1,262 @@
-import pandas as pd
+from collections import deque
+
 import psycopg2
-from db.connection import get_connection
+import psycopg2.errors
+from psycopg2 import sql as pgsql
+import streamlit as st
+from db.connection import borrow
+
+# Rows pulled per round trip from the server-side cursor
+FETCH_SIZE = 2000
+
+# Rows shown per page of query results
+PAGE_SIZE = 1000
+
+# Most recent RAISE NOTICE messages kept per procedure call
+NOTICE_LIMIT = 50
+
+# psycopg2 errors reported as ValueError, per executor entry point;
+# anything not listed becomes a generic "Database error"
+_QUERY_ERRORS = {
+    psycopg2.errors.UndefinedFunction: (
+        "Database function not found: {}\n"
+        "💡 Tip: Ensure all functions in database/functions/ are created in your database."
+    ),
+    psycopg2.errors.UndefinedTable: "Table not found: {}",
+    psycopg2.errors.UndefinedColumn: "Column not found: {}",
+    psycopg2.errors.SyntaxError: "SQL syntax error: {}",
+}
+
+_PROCEDURE_ERRORS = {
+    # Custom exceptions from procedure logic
+    psycopg2.errors.RaiseException: "Procedure validation error: {}",
+    psycopg2.errors.InvalidParameterValue: "Invalid parameter value: {}",
+    psycopg2.errors.ForeignKeyViolation: "Foreign key constraint error: {}",
+    psycopg2.errors.CheckViolation: "Check constraint error: {}",
+}
+
+_FUNCTION_ERRORS = {
+    psycopg2.errors.UndefinedFunction: "Function not found in database: {}",
+    # Custom exceptions from function logic (e.g., "Batch does not exist")
+    psycopg2.errors.RaiseException: "Function error: {}",
+    psycopg2.errors.InvalidParameterValue: "Invalid parameter value: {}",
+    psycopg2.errors.NumericValueOutOfRange: "Numeric value out of range: {}",
+}
 
 
-def run_query(sql):
+def _translate(e, messages):
+    """Build the exception to raise for a psycopg2 error."""
+    template = messages.get(type(e))
+    if template is not None:
+        return ValueError(template.format(e))
+    return Exception(f"Database error: {e}")
+
+
+def _strip_terminator(sql):
+    """Drop surrounding whitespace and trailing semicolons from a statement."""
+    return sql.strip().rstrip(";").rstrip()
+
+
+def _fetch_table(conn, sql, params=None):
     """
-    Execute a SQL query and return results as DataFrame.
+    Run a SELECT through a server-side cursor and build an Arrow table.
+
+    Rows are fetched in FETCH_SIZE batches and assembled column-wise. The
+    table is returned as-is: st.dataframe consumes Arrow natively, so no
+    pandas conversion is needed on the display path.
+    """
+    # Imported here so procedure and scalar calls never pay for pyarrow
+    import pyarrow as pa
+
+    # DECLARE ... CURSOR FOR does not accept a trailing semicolon
+    if isinstance(sql, str):
+        sql = _strip_terminator(sql)
+
+    with conn.cursor(name="bluecon_fetch") as cur:
+        cur.itersize = FETCH_SIZE
+        cur.execute(sql, params)
+
+        rows = cur.fetchmany(FETCH_SIZE)
+        names = [col.name for col in cur.description]
+        columns = [[] for _ in names]
+
+        while rows:
+            for column, values in zip(columns, zip(*rows)):
+                column.extend(values)
+            rows = cur.fetchmany(FETCH_SIZE)
+
+    return pa.Table.from_arrays([pa.array(col) for col in columns], names=names)
+
+
+def run_query(sql, offset=0, limit=PAGE_SIZE):
+    """
+    Execute a SQL query and return one page of results as an Arrow table.
 
     Args:
         sql: SQL SELECT statement
+        offset: Number of leading rows to skip
+        limit: Maximum number of rows to return
 
     Returns:
-        pandas.DataFrame with query results
+        pyarrow.Table with query results
 
     Raises:
         ValueError: For validation errors, undefined functions, or constraint violations
         Exception: For other database errors
     """
-    conn = None
+    # Only the requested window is fetched; literal % must be escaped
+    # once the statement carries parameters
+    paged_sql = (
+        f"SELECT * FROM ({_strip_terminator(sql).replace('%', '%%')}\n) AS _page "
+        "OFFSET %s LIMIT %s"
+    )
+
     try:
-        conn = get_connection()
-        df = pd.read_sql(sql, conn)
-        return df
-    except psycopg2.errors.UndefinedFunction as e:
-        raise ValueError(
-            f"Database function not found: {str(e)}\n"
-            "💡 Tip: Ensure all functions in database/functions/ are created in your database."
-        )
-    except psycopg2.errors.UndefinedTable as e:
-        raise ValueError(f"Table not found: {str(e)}")
-    except psycopg2.errors.UndefinedColumn as e:
-        raise ValueError(f"Column not found: {str(e)}")
-    except psycopg2.errors.SyntaxError as e:
-        raise ValueError(f"SQL syntax error: {str(e)}")
+        with borrow() as conn:
+            table = _fetch_table(conn, paged_sql, (offset, limit))
+        return table
     except psycopg2.Error as e:
-        raise Exception(f"Database error: {str(e)}")
+        raise _translate(e, _QUERY_ERRORS)
     except Exception as e:
         raise Exception(f"Unexpected error: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
 
-def run_procedure(call_statement):
+def run_procedure(call_statement, params=None):
     """
     Execute a stored procedure CALL statement.
 
     Args:
-        call_statement: CALL procedure_name(args);
+        call_statement: CALL statement as str or psycopg2.sql.Composable
+            (e.g., "CALL procedure_name(%s, %s)")
+        params: Values for the placeholders in call_statement
 
     Returns:
         dict: {
             'success': bool,
-            'notices': list of strings from RAISE NOTICE
+            'notices': deque of strings from RAISE NOTICE
         }
 
     Raises:
         ValueError: For validation errors or RAISE EXCEPTION
         Exception: For other database errors
     """
-    conn = None
-    cur = None
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(call_statement)
-        conn.commit()
+        with borrow() as conn:
+            # Fresh bounded buffer for this call only: the connection is
+            # shared, so the buffer is swapped back out before release and
+            # later statements cannot append to the returned notices
+            previous_notices = conn.notices
+            conn.notices = deque(maxlen=NOTICE_LIMIT)
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(call_statement, params)
+                conn.commit()
 
-        # Capture RAISE NOTICE messages from PostgreSQL
-        notices = (
-            list(conn.notices) if hasattr(conn, "notices") and conn.notices else []
-        )
+                # RAISE NOTICE messages from PostgreSQL
+                notices = conn.notices
+            finally:
+                conn.notices = previous_notices
 
         return {"success": True, "notices": notices}
 
-    except psycopg2.errors.RaiseException as e:
-        # Custom exceptions from procedure logic
-        raise ValueError(f"Procedure validation error: {str(e)}")
-    except psycopg2.errors.InvalidParameterValue as e:
-        raise ValueError(f"Invalid parameter value: {str(e)}")
-    except psycopg2.errors.ForeignKeyViolation as e:
-        raise ValueError(f"Foreign key constraint error: {str(e)}")
-    except psycopg2.errors.CheckViolation as e:
-        raise ValueError(f"Check constraint error: {str(e)}")
     except psycopg2.Error as e:
-        raise Exception(f"Database error: {str(e)}")
+        raise _translate(e, _PROCEDURE_ERRORS)
     except Exception as e:
         raise Exception(f"Unexpected error: {str(e)}")
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
-def run_function(sql):
+def run_function(sql, params=None):
     """
     Execute a database function and return results.
 
     Args:
-        sql: SQL function call (e.g., "SELECT * FROM func(1);")
+        sql: SQL function call as str or psycopg2.sql.Composable
+            (e.g., "SELECT * FROM func(%s)")
+        params: Values for the placeholders in sql
 
     Returns:
-        pandas.DataFrame with results
+        pyarrow.Table with results
 
     Raises:
         ValueError: For invalid parameters or function not found
         Exception: For other database errors
     """
-    conn = None
     try:
-        conn = get_connection()
-        df = pd.read_sql(sql, conn)
-        return df
-    except psycopg2.errors.UndefinedFunction as e:
-        raise ValueError(f"Function not found in database: {str(e)}")
-    except psycopg2.errors.RaiseException as e:
-        # Custom exceptions from function logic (e.g., "Batch does not exist")
-        raise ValueError(f"Function error: {str(e)}")
-    except psycopg2.errors.InvalidParameterValue as e:
-        raise ValueError(f"Invalid parameter value: {str(e)}")
-    except psycopg2.errors.NumericValueOutOfRange as e:
-        raise ValueError(f"Numeric value out of range: {str(e)}")
+        with borrow() as conn:
+            table = _fetch_table(conn, sql, params)
+        return table
     except psycopg2.Error as e:
-        raise Exception(f"Database error: {str(e)}")
+        raise _translate(e, _FUNCTION_ERRORS)
     except Exception as e:
         raise Exception(f"Unexpected error: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
+
+
+def run_function_scalar(sql, params=None):
+    """
+    Execute a function that returns a single value.
+
+    Skips building a table for the common one-cell result.
+
+    Args:
+        sql: SQL function call as str or psycopg2.sql.Composable
+            (e.g., "SELECT func(%s) AS result")
+        params: Values for the placeholders in sql
+
+    Returns:
+        The value of the first column of the first row, or None if the
+        query returned no rows
+
+    Raises:
+        ValueError: For invalid parameters or function not found
+        Exception: For other database errors
+    """
+    try:
+        with borrow() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                row = cur.fetchone()
+        return None if row is None else row[0]
+    except psycopg2.Error as e:
+        raise _translate(e, _FUNCTION_ERRORS)
+    except Exception as e:
+        raise Exception(f"Unexpected error: {str(e)}")
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def cached_run_query(sql, offset=0, limit=PAGE_SIZE):
+    """
+    Cached variant of run_query() keyed by the SQL text and page window.
+
+    Streamlit reruns the whole script on every widget interaction, so
+    identical queries are served from memory instead of hitting the
+    database again. Call cached_run_query.clear() to invalidate.
+    """
+    return run_query(sql, offset, limit)
+
+
+# Composed statements are hashed by their (deterministic) repr
+@st.cache_data(
+    ttl=300, max_entries=64, show_spinner=False, hash_funcs={pgsql.Composed: repr}
+)
+def cached_run_function(sql, params=()):
+    """
+    Cached variant of run_function() keyed by the SQL text and parameters.
+
+    Procedures are never cached since they mutate data.
+    """
+    return run_function(sql, params)
+
+
+@st.cache_data(
+    ttl=300, max_entries=64, show_spinner=False, hash_funcs={pgsql.Composed: repr}
+)
+def cached_run_function_scalar(sql, params=()):
+    """Cached variant of run_function_scalar() keyed by the SQL text and parameters."""
+    return run_function_scalar(sql, params)
+
+
+def render_sql(sql, params=None):
+    """Return the statement exactly as the driver will send it, for display."""
+    with borrow() as conn:
+        with conn.cursor() as cur:
+            return cur.mogrify(sql, params).decode()
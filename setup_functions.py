@@ -31,6 +31,22 @@ def create_function(conn, sql_file):
         if cur:
             cur.close()
 
+def create_all_functions(conn, sql_files):
+    """Execute every function SQL file in a single transaction."""
+    cur = None
+    try:
+        cur = conn.cursor()
+        bodies = [sql_file.read_text() for sql_file in sql_files]
+        cur.execute("\n".join(bodies))
+        conn.commit()
+        return True, None
+    except psycopg2.Error as e:
+        conn.rollback()
+        return False, str(e)
+    finally:
+        if cur:
+            cur.close()
+
 def main():
     """Create all database functions."""
     print("🔧 Setting up database functions...")
@@ -56,16 +72,27 @@ def main():
         success_count = 0
         failed_count = 0
         
-        for sql_file in sql_files:
-            print(f"Creating function from {sql_file.name}...", end=" ")
-            success, error = create_function(conn, sql_file)
-            
-            if success:
-                print("✅")
-                success_count += 1
-            else:
-                print(f"❌\n   Error: {error}")
-                failed_count += 1
+        # Fast path: one round trip and one commit for all files
+        print("Creating all functions in one transaction...", end=" ")
+        success, error = create_all_functions(conn, sql_files)
+        
+        if success:
+            print("✅")
+            success_count = len(sql_files)
+        else:
+            # Fall back to per-file execution to isolate the broken file
+            print("❌\n   Retrying file by file...")
+            print()
+            for sql_file in sql_files:
+                print(f"Creating function from {sql_file.name}...", end=" ")
+                success, error = create_function(conn, sql_file)
+                
+                if success:
+                    print("✅")
+                    success_count += 1
+                else:
+                    print(f"❌\n   Error: {error}")
+                    failed_count += 1
         
         print()
         print(f"{'='*60}")
@@ -0,0 +1,43 @@
+from utils.function_parser import parse_function_metadata
+from utils.param_types import ParamType
+
+
+def test_metadata_after_other_create_statements():
+    sql_content = """\
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE TYPE batch_status AS ENUM ('active', 'harvested');
+
+-- FUNCTION_METADATA
+-- name: batch_status_of
+-- params: p_batch_id:int
+-- description: Current status of a batch
+-- returns: text
+-- END_METADATA
+CREATE OR REPLACE FUNCTION batch_status_of(p_batch_id INT)
+RETURNS TEXT AS $$
+    SELECT 'active';
+$$ LANGUAGE sql;
+"""
+
+    assert parse_function_metadata(sql_content) == {
+        "name": "batch_status_of",
+        "params": [
+            {"name": "p_batch_id", "type": "INT", "type_code": ParamType.INT}
+        ],
+        "description": "Current status of a batch",
+        "returns": "TEXT",
+    }
+
+
+def test_metadata_without_end_marker():
+    sql_content = """\
+-- FUNCTION_METADATA
+-- name: unfinished
+CREATE FUNCTION unfinished() RETURNS INT AS $$ SELECT 1 $$ LANGUAGE sql;
+"""
+
+    assert parse_function_metadata(sql_content) is None
+
+
+def test_no_metadata():
+    assert parse_function_metadata("CREATE FUNCTION f() RETURNS INT;") is None
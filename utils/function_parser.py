@@ -1,7 +1,41 @@
-import re
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+import streamlit as st
 
+from utils.param_types import param_type_code
+
+
+def _parse_params(params_str: str) -> List[Dict]:
+    """Parse "name:TYPE,name:TYPE" into a list of param dicts."""
+    params = []
+
+    if params_str and params_str.lower() != "none":
+        for param in params_str.split(","):
+            param_name, sep, param_type = param.partition(":")
+            if sep:
+                param_type = param_type.strip().upper()
+                params.append(
+                    {
+                        "name": param_name.strip(),
+                        "type": param_type,
+                        "type_code": param_type_code(param_type),
+                    }
+                )
+
+    return params
+
+
+# Field name -> converter for its (stripped) value
+_FIELD_PARSERS = {
+    "name": str,
+    "description": str,
+    "returns": str.upper,
+    "params": _parse_params,
+}
+
+
+@lru_cache(maxsize=256)
 def parse_function_metadata(sql_content: str) -> Optional[Dict]:
     """
     Parse metadata from SQL function file.
@@ -20,65 +54,50 @@ def parse_function_metadata(sql_content: str) -> Optional[Dict]:
     Returns:
         dict: {
             'name': str,
-            'params': [{'name': str, 'type': str}, ...],
+            'params': [{'name': str, 'type': str, 'type_code': ParamType}, ...],
             'description': str,
             'returns': str
         }
         or None if no metadata found
-    """
-    # Pattern to match metadata block
-    metadata_pattern = r"-- FUNCTION_METADATA\s*(.*?)\s*-- END_METADATA"
 
-    match = re.search(metadata_pattern, sql_content, re.DOTALL)
-
-    if not match:
+    Results are memoized per SQL content, so the returned dict is shared
+    between callers and must not be mutated.
+    """
+    # Slice out just the metadata block, so neither the (possibly long)
+    # function body nor any other DDL in the file is scanned
+    block_start = sql_content.find("-- FUNCTION_METADATA")
+    if block_start == -1:
         return None
 
-    metadata_block = match.group(1)
+    block_end = sql_content.find("-- END_METADATA", block_start)
+    if block_end == -1:
+        return None
 
-    # Parse individual fields
     result = {
         "name": None,
         "params": [],
         "description": None,
         "returns": "DECIMAL",  # Default return type
     }
+    seen = set()
+
+    # Skip the marker line; first occurrence of each field wins
+    for line in sql_content[block_start:block_end].splitlines()[1:]:
+        line = line.strip()
+        if not line.startswith("--"):
+            continue
 
-    # Extract name
-    name_match = re.search(r"--\s*name:\s*(.+)", metadata_block)
-    if name_match:
-        result["name"] = name_match.group(1).strip()
-
-    # Extract description
-    desc_match = re.search(r"--\s*description:\s*(.+)", metadata_block)
-    if desc_match:
-        result["description"] = desc_match.group(1).strip()
-
-    # Extract return type
-    returns_match = re.search(r"--\s*returns:\s*(.+)", metadata_block)
-    if returns_match:
-        result["returns"] = returns_match.group(1).strip().upper()
-
-    # Extract parameters
-    params_match = re.search(r"--\s*params:\s*(.+)", metadata_block)
-    if params_match:
-        params_str = params_match.group(1).strip()
-
-        if params_str and params_str.lower() != "none":
-            # Split by comma and parse each parameter
-            param_list = params_str.split(",")
-
-            for param in param_list:
-                param = param.strip()
-                if ":" in param:
-                    param_name, param_type = param.split(":", 1)
-                    result["params"].append(
-                        {"name": param_name.strip(), "type": param_type.strip().upper()}
-                    )
+        key, sep, value = line[2:].lstrip().partition(":")
+        parser = _FIELD_PARSERS.get(key)
+        if not sep or parser is None or key in seen:
+            continue
+        seen.add(key)
+        result[key] = parser(value.strip())
 
     return result
 
 
+@st.cache_data(show_spinner=False)
 def get_all_function_metadata(functions_dict: Dict[str, str]) -> Dict[str, Dict]:
     """
     Parse metadata for all loaded functions.
@@ -89,11 +108,8 @@ def get_all_function_metadata(functions_dict: Dict[str, str]) -> Dict[str, Dict]
     Returns:
         dict: Dictionary mapping function file stem to metadata dict
     """
-    result = {}
-
-    for func_name, sql_content in functions_dict.items():
-        metadata = parse_function_metadata(sql_content)
-        if metadata:
-            result[func_name] = metadata
-
-    return result
+    return {
+        func_name: metadata
+        for func_name, sql_content in functions_dict.items()
+        if (metadata := parse_function_metadata(sql_content))
+    }
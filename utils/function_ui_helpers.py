@@ -1,162 +1,215 @@
 import streamlit as st
 from datetime import date
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2 import sql
+
+from utils.param_types import ParamType, param_type_code
+from utils.sql_call import compose_call
+
+
+# Widget label/help templates; %s is the parameter name
+_LABEL_INT = "%s (Integer)"
+_HELP_INT = "Enter an integer value for %s"
+_LABEL_DECIMAL = "%s (Decimal)"
+_HELP_DECIMAL = "Enter a decimal value for %s"
+_LABEL_TEXT = "%s (Text)"
+_HELP_TEXT = "Enter text for %s"
+_LABEL_DATE = "%s (Date)"
+_HELP_DATE = "Select a date for %s"
+_LABEL_TIME = "%s (Time)"
+_HELP_BOOL = "Check or uncheck for %s"
+_LABEL_OTHER = "%s (%s)"
+_HELP_OTHER = "Enter value for %s"
+
+
+@lru_cache(maxsize=256)
+def _widget_spec(
+    param_name: str, param_type: str, type_code: ParamType
+) -> Dict[str, Any]:
+    """
+    Static keyword arguments for a parameter's input widget.
+
+    Labels, help texts and formats only depend on the parameter name and
+    type, so they are built once and reused on every rerun. Values that
+    change over time (today's date) are supplied by the renderers. The
+    returned dict is shared and must not be mutated.
+    """
+    if type_code == ParamType.INT:
+        return {
+            "label": _LABEL_INT % param_name,
+            "value": 1,
+            "step": 1,
+            "format": "%d",
+            "help": _HELP_INT % param_name,
+        }
+    if type_code == ParamType.DECIMAL:
+        return {
+            "label": _LABEL_DECIMAL % param_name,
+            "value": 0.0,
+            "step": 0.01,
+            "format": "%.2f",
+            "help": _HELP_DECIMAL % param_name,
+        }
+    if type_code == ParamType.TEXT:
+        return {
+            "label": _LABEL_TEXT % param_name,
+            "value": "",
+            "help": _HELP_TEXT % param_name,
+        }
+    if type_code == ParamType.DATE:
+        return {
+            "label": _LABEL_DATE % param_name,
+            "help": _HELP_DATE % param_name,
+        }
+    if type_code == ParamType.BOOL:
+        return {
+            "label": param_name,
+            "value": False,
+            "help": _HELP_BOOL % param_name,
+        }
+    if type_code == ParamType.TIMESTAMP:
+        return {
+            "date_label": _LABEL_DATE % param_name,
+            "time_label": _LABEL_TIME % param_name,
+        }
+
+    # Default fallback to text input
+    return {
+        "label": _LABEL_OTHER % (param_name, param_type),
+        "value": "",
+        "help": _HELP_OTHER % param_name,
+    }
+
+
+def _number_widget(param_name: str, param_type: str, type_code: ParamType) -> Any:
+    return st.number_input(**_widget_spec(param_name, param_type, type_code))
+
+
+def _text_widget(param_name: str, param_type: str, type_code: ParamType) -> Any:
+    return st.text_input(**_widget_spec(param_name, param_type, type_code))
+
+
+def _date_widget(param_name: str, param_type: str, type_code: ParamType) -> Any:
+    spec = _widget_spec(param_name, param_type, type_code)
+    return st.date_input(value=date.today(), **spec)
+
+
+def _bool_widget(param_name: str, param_type: str, type_code: ParamType) -> Any:
+    return st.checkbox(**_widget_spec(param_name, param_type, type_code))
+
+
+def _timestamp_widget(
+    param_name: str, param_type: str, type_code: ParamType
+) -> Any:
+    spec = _widget_spec(param_name, param_type, type_code)
+    col1, col2 = st.columns(2)
+    with col1:
+        date_val = st.date_input(spec["date_label"], value=date.today())
+    with col2:
+        time_val = st.time_input(spec["time_label"])
+    return f"{date_val} {time_val}"
+
+
+# Widget renderer per kind, indexed by ParamType
+_WIDGET_BUILDERS = (
+    _number_widget,  # INT
+    _number_widget,  # DECIMAL
+    _text_widget,  # TEXT
+    _date_widget,  # DATE
+    _bool_widget,  # BOOL
+    _timestamp_widget,  # TIMESTAMP
+    _text_widget,  # OTHER
+)
 
 
-def render_input_widget(param_name: str, param_type: str) -> Any:
+def render_input_widget(
+    param_name: str, param_type: str, type_code: Optional[ParamType] = None
+) -> Any:
     """
     Render appropriate Streamlit input widget based on SQL parameter type.
 
     Args:
         param_name: Name of the parameter
         param_type: SQL type (INT, DECIMAL, TEXT, DATE, etc.)
+        type_code: ParamType from parsed metadata; when given, param_type is
+            assumed to be upper-case already and is not re-canonicalized
 
     Returns:
         User input value from the widget
     """
-    param_type = param_type.upper()
-
-    # Integer types
-    if param_type in ["INT", "INTEGER", "BIGINT", "SMALLINT"]:
-        return st.number_input(
-            f"{param_name} (Integer)",
-            value=1,
-            step=1,
-            format="%d",
-            help=f"Enter an integer value for {param_name}",
-        )
-
-    # Decimal/Float types
-    elif param_type in ["DECIMAL", "NUMERIC", "FLOAT", "REAL", "DOUBLE"]:
-        return st.number_input(
-            f"{param_name} (Decimal)",
-            value=0.0,
-            step=0.01,
-            format="%.2f",
-            help=f"Enter a decimal value for {param_name}",
-        )
-
-    # Text types
-    elif param_type in ["TEXT", "VARCHAR", "CHAR", "STRING"]:
-        return st.text_input(
-            f"{param_name} (Text)", value="", help=f"Enter text for {param_name}"
-        )
-
-    # Date type
-    elif param_type == "DATE":
-        return st.date_input(
-            f"{param_name} (Date)",
-            value=date.today(),
-            help=f"Select a date for {param_name}",
-        )
-
-    # Boolean type
-    elif param_type in ["BOOLEAN", "BOOL"]:
-        return st.checkbox(
-            f"{param_name}", value=False, help=f"Check or uncheck for {param_name}"
-        )
-
-    # Timestamp type
-    elif param_type in ["TIMESTAMP", "DATETIME"]:
-        col1, col2 = st.columns(2)
-        with col1:
-            date_val = st.date_input(f"{param_name} (Date)", value=date.today())
-        with col2:
-            time_val = st.time_input(f"{param_name} (Time)")
-        return f"{date_val} {time_val}"
+    if type_code is None:
+        param_type = param_type.upper()
+        type_code = param_type_code(param_type)
 
-    # Default fallback to text input
-    else:
-        return st.text_input(
-            f"{param_name} ({param_type})",
-            value="",
-            help=f"Enter value for {param_name}",
-        )
+    return _WIDGET_BUILDERS[type_code](param_name, param_type, type_code)
 
 
 def build_function_call(
     func_name: str, params_dict: Dict[str, Any], return_type: str = "DECIMAL"
-) -> str:
+) -> Tuple[sql.Composed, List[Any]]:
     """
-    Build SQL SELECT statement to call a function with parameters.
+    Build parameterized SQL SELECT statement to call a function.
 
     Args:
-        func_name: Name of the function
+        func_name: Name of the function (optionally schema-qualified)
         params_dict: Dictionary of parameter names to values
         return_type: Return type of function (DECIMAL, TABLE, INT, etc.)
 
     Returns:
-        SQL query string to execute the function
+        Tuple of (composed SQL with placeholders, list of parameter values);
+        the function name is quoted as an identifier and values are passed
+        to the driver separately instead of being inlined into the SQL text
 
     Examples:
-        SELECT calculate_batch_profit(1);
-        SELECT * FROM get_tank_water_quality_status(5);
+        SELECT "calculate_batch_profit"(%s) AS result   with [1]
+        SELECT * FROM "get_tank_water_quality_status"(%s)   with [5]
     """
-    if not params_dict:
-        # No parameters
-        if return_type == "TABLE":
-            return f"SELECT * FROM {func_name}();"
-        else:
-            return f"SELECT {func_name}() AS result;"
-
-    # Format parameters based on type
-    formatted_params = []
-
-    for param_name, param_value in params_dict.items():
-        if param_value is None or param_value == "":
-            formatted_params.append("NULL")
-        elif isinstance(param_value, str):
-            # Escape single quotes and wrap in quotes
-            escaped_value = param_value.replace("'", "''")
-            formatted_params.append(f"'{escaped_value}'")
-        elif isinstance(param_value, bool):
-            formatted_params.append(str(param_value).upper())
-        elif isinstance(param_value, (int, float)):
-            formatted_params.append(str(param_value))
-        elif isinstance(param_value, date):
-            formatted_params.append(f"'{param_value}'")
-        else:
-            # Generic fallback
-            formatted_params.append(f"'{param_value}'")
-
-    params_str = ", ".join(formatted_params)
-
     # Check if function returns TABLE (use SELECT *)
     if return_type == "TABLE":
-        return f"SELECT * FROM {func_name}({params_str});"
+        return compose_call("SELECT * FROM {}({})", func_name, params_dict)
     else:
-        return f"SELECT {func_name}({params_str}) AS result;"
+        return compose_call("SELECT {}({}) AS result", func_name, params_dict)
+
+
+def _is_integral(param_value: Any) -> bool:
+    return isinstance(param_value, int) or (
+        isinstance(param_value, float) and param_value.is_integer()
+    )
+
+
+def _accept_any(param_value: Any) -> bool:
+    return True
 
 
-def validate_param_value(param_value: Any, param_type: str) -> bool:
+# Value check per kind, indexed by ParamType
+_VALIDATORS = (
+    _is_integral,  # INT
+    lambda v: isinstance(v, (int, float)),  # DECIMAL
+    lambda v: isinstance(v, str),  # TEXT
+    lambda v: isinstance(v, date),  # DATE
+    lambda v: isinstance(v, bool),  # BOOL
+    _accept_any,  # TIMESTAMP
+    _accept_any,  # OTHER
+)
+
+
+def validate_param_value(
+    param_value: Any, param_type: str, type_code: Optional[ParamType] = None
+) -> bool:
     """
     Optional: Validate parameter value matches expected type.
 
     Args:
         param_value: The input value
         param_type: Expected SQL type
+        type_code: ParamType from parsed metadata, if already known
 
     Returns:
         True if valid, False otherwise
     """
-    param_type = param_type.upper()
-
-    if param_type in ["INT", "INTEGER", "BIGINT", "SMALLINT"]:
-        return isinstance(param_value, int) or (
-            isinstance(param_value, float) and param_value.is_integer()
-        )
-
-    elif param_type in ["DECIMAL", "NUMERIC", "FLOAT", "REAL", "DOUBLE"]:
-        return isinstance(param_value, (int, float))
+    if type_code is None:
+        type_code = param_type_code(param_type.upper())
 
-    elif param_type in ["TEXT", "VARCHAR", "CHAR", "STRING"]:
-        return isinstance(param_value, str)
-
-    elif param_type == "DATE":
-        return isinstance(param_value, date)
-
-    elif param_type in ["BOOLEAN", "BOOL"]:
-        return isinstance(param_value, bool)
-
-    # Default: accept any value
-    return True
+    return _VALIDATORS[type_code](param_value)
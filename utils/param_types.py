@@ -0,0 +1,45 @@
+from enum import IntEnum
+
+
+class ParamType(IntEnum):
+    """Canonical parameter kinds; values index per-kind dispatch tuples."""
+
+    INT = 0
+    DECIMAL = 1
+    TEXT = 2
+    DATE = 3
+    BOOL = 4
+    TIMESTAMP = 5
+    OTHER = 6
+
+
+# SQL type names grouped by canonical kind
+_INT_TYPES = frozenset({"INT", "INTEGER", "BIGINT", "SMALLINT"})
+_DECIMAL_TYPES = frozenset({"DECIMAL", "NUMERIC", "FLOAT", "REAL", "DOUBLE"})
+_TEXT_TYPES = frozenset({"TEXT", "VARCHAR", "CHAR", "STRING"})
+_DATE_TYPES = frozenset({"DATE"})
+_BOOL_TYPES = frozenset({"BOOLEAN", "BOOL"})
+_TIMESTAMP_TYPES = frozenset({"TIMESTAMP", "DATETIME"})
+
+# Upper-case SQL type name -> kind
+_TYPE_CODE = (
+    {t: ParamType.INT for t in _INT_TYPES}
+    | {t: ParamType.DECIMAL for t in _DECIMAL_TYPES}
+    | {t: ParamType.TEXT for t in _TEXT_TYPES}
+    | {t: ParamType.DATE for t in _DATE_TYPES}
+    | {t: ParamType.BOOL for t in _BOOL_TYPES}
+    | {t: ParamType.TIMESTAMP for t in _TIMESTAMP_TYPES}
+)
+
+
+def param_type_code(param_type: str) -> ParamType:
+    """
+    Map an upper-case SQL type name to its ParamType.
+
+    Args:
+        param_type: SQL type as stored in parsed metadata (e.g. "VARCHAR")
+
+    Returns:
+        ParamType member; unknown types (JSON, ...) map to OTHER
+    """
+    return _TYPE_CODE.get(param_type, ParamType.OTHER)
@@ -1,7 +1,39 @@
-import re
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+from utils.param_types import ParamType, param_type_code
 
+
+def _parse_params(
+    params_str: str,
+) -> Tuple[List[str], List[str], List[ParamType]]:
+    """Parse "name:TYPE,name:TYPE" into parallel name, type and code lists."""
+    param_names = []
+    param_types = []
+    param_type_codes = []
+
+    if params_str and params_str.lower() != "none":
+        for param in params_str.split(","):
+            param_name, sep, param_type = param.partition(":")
+            if sep:
+                param_names.append(param_name.strip())
+                param_type = param_type.strip().upper()
+                param_types.append(param_type)
+                param_type_codes.append(param_type_code(param_type))
+
+    return param_names, param_types, param_type_codes
+
+
+# Field name -> converter for its (stripped) value
+_FIELD_PARSERS = {
+    "name": str,
+    "description": str,
+    "returns": str.upper,
+    "params": _parse_params,
+}
+
+
+@lru_cache(maxsize=512)
 def parse_procedure_metadata(sql_content: str) -> Optional[Dict]:
     """
     Parse metadata from SQL procedure file.
@@ -20,63 +52,66 @@ def parse_procedure_metadata(sql_content: str) -> Optional[Dict]:
     Returns:
         dict: {
             'name': str,
-            'params': [{'name': str, 'type': str}, ...],
+            'param_names': [str, ...],
+            'param_types': [str, ...],  # parallel to param_names
+            'param_type_codes': [ParamType, ...],  # parallel to param_names
             'description': str,
             'returns': str
         }
         or None if no metadata found
-    """
-    # Pattern to match metadata block
-    metadata_pattern = r"-- PROCEDURE_METADATA\s*(.*?)\s*-- END_METADATA"
-
-    match = re.search(metadata_pattern, sql_content, re.DOTALL)
 
-    if not match:
+    Results are memoized per SQL content, so the returned dict is shared
+    between callers and must not be mutated.
+    """
+    # Cheap rejection of files without a metadata block
+    if "-- PROCEDURE_METADATA" not in sql_content:
         return None
 
-    metadata_block = match.group(1)
-
-    # Parse individual fields
-    result = {
-        "name": None,
-        "params": [],
-        "description": None,
-        "returns": "VOID",  # Default return type for procedures
-    }
-
-    # Extract name
-    name_match = re.search(r"--\s*name:\s*(.+)", metadata_block)
-    if name_match:
-        result["name"] = name_match.group(1).strip()
-
-    # Extract description
-    desc_match = re.search(r"--\s*description:\s*(.+)", metadata_block)
-    if desc_match:
-        result["description"] = desc_match.group(1).strip()
-
-    # Extract return type
-    returns_match = re.search(r"--\s*returns:\s*(.+)", metadata_block)
-    if returns_match:
-        result["returns"] = returns_match.group(1).strip().upper()
-
-    # Extract parameters
-    params_match = re.search(r"--\s*params:\s*(.+)", metadata_block)
-    if params_match:
-        params_str = params_match.group(1).strip()
-
-        if params_str and params_str.lower() != "none":
-            # Split by comma and parse each parameter
-            param_list = params_str.split(",")
-
-            for param in param_list:
-                param = param.strip()
-                if ":" in param:
-                    param_name, param_type = param.split(":", 1)
-                    result["params"].append(
-                        {"name": param_name.strip(), "type": param_type.strip().upper()}
-                    )
-
-    return result
+    result = None
+    in_block = False
+    seen = set()
+
+    # Single pass over the lines; first occurrence of each field wins
+    for line in sql_content.splitlines():
+        line = line.strip()
+
+        if not in_block:
+            if line.startswith("-- PROCEDURE_METADATA"):
+                in_block = True
+                result = {
+                    "name": None,
+                    "param_names": [],
+                    "param_types": [],
+                    "param_type_codes": [],
+                    "description": None,
+                    "returns": "VOID",  # Default return type for procedures
+                }
+            continue
+
+        if line.startswith("-- END_METADATA"):
+            return result
+
+        if not line.startswith("--"):
+            continue
+
+        key, sep, value = line[2:].lstrip().partition(":")
+        parser = _FIELD_PARSERS.get(key)
+        if not sep or parser is None or key in seen:
+            continue
+        seen.add(key)
+        value = parser(value.strip())
+
+        if key == "params":
+            (
+                result["param_names"],
+                result["param_types"],
+                result["param_type_codes"],
+            ) = value
+        else:
+            result[key] = value
+
+    # No block, or block without END_METADATA
+    return None
 
 
 def get_all_procedure_metadata(procedures_dict: Dict[str, str]) -> Dict[str, Dict]:
@@ -89,11 +124,8 @@ def get_all_procedure_metadata(procedures_dict: Dict[str, str]) -> Dict[str, Dic
     Returns:
         dict: Dictionary mapping procedure file stem to metadata dict
     """
-    result = {}
-
-    for proc_name, sql_content in procedures_dict.items():
-        metadata = parse_procedure_metadata(sql_content)
-        if metadata:
-            result[proc_name] = metadata
-
-    return result
+    return {
+        proc_name: metadata
+        for proc_name, sql_content in procedures_dict.items()
+        if (metadata := parse_procedure_metadata(sql_content))
+    }
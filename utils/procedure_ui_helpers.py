@@ -1,45 +1,27 @@
-from typing import Any, Dict
-from datetime import date
+from typing import Any, Dict, List, Tuple
 
+from psycopg2 import sql
 
-def build_procedure_call(proc_name: str, params_dict: Dict[str, Any]) -> str:
+from utils.sql_call import compose_call
+
+
+def build_procedure_call(
+    proc_name: str, params_dict: Dict[str, Any]
+) -> Tuple[sql.Composed, List[Any]]:
     """
-    Build CALL statement to execute a procedure with parameters.
+    Build parameterized CALL statement to execute a procedure.
 
     Args:
-        proc_name: Name of the procedure
+        proc_name: Name of the procedure (optionally schema-qualified)
         params_dict: Dictionary of parameter names to values
 
     Returns:
-        SQL CALL statement string
+        Tuple of (composed CALL statement with placeholders, list of
+        parameter values); values are passed to the driver separately
+        instead of being inlined into the SQL text
 
     Examples:
-        CALL create_batch(1, 5, 1000, '2024-01-15');
-        CALL record_feeding(1, 'pellets', 500.0, 25.50, NULL, 'Morning feed');
+        CALL "create_batch"(%s, %s, %s, %s)   with [1, 5, 1000, date(2024, 1, 15)]
+        CALL "record_feeding"(%s, %s, %s, %s, %s, %s)   with [1, 'pellets', ...]
     """
-    if not params_dict:
-        # No parameters
-        return f"CALL {proc_name}();"
-
-    # Format parameters based on type
-    formatted_params = []
-
-    for param_name, param_value in params_dict.items():
-        if param_value is None or param_value == "":
-            formatted_params.append("NULL")
-        elif isinstance(param_value, str):
-            # Escape single quotes and wrap in quotes
-            escaped_value = param_value.replace("'", "''")
-            formatted_params.append(f"'{escaped_value}'")
-        elif isinstance(param_value, bool):
-            formatted_params.append(str(param_value).upper())
-        elif isinstance(param_value, (int, float)):
-            formatted_params.append(str(param_value))
-        elif isinstance(param_value, date):
-            formatted_params.append(f"'{param_value}'")
-        else:
-            # Generic fallback
-            formatted_params.append(f"'{param_value}'")
-
-    params_str = ", ".join(formatted_params)
-    return f"CALL {proc_name}({params_str});"
+    return compose_call("CALL {}({})", proc_name, params_dict)
@@ -0,0 +1,28 @@
+from typing import Any, Dict, List, Tuple
+
+from psycopg2 import sql
+
+
+def compose_call(
+    template: str, routine_name: str, params_dict: Dict[str, Any]
+) -> Tuple[sql.Composed, List[Any]]:
+    """
+    Compose a parameterized call to a database function or procedure.
+
+    Args:
+        template: SQL with two {} slots, for the routine name and the
+            argument list (e.g., "CALL {}({})")
+        routine_name: Name of the function/procedure (optionally schema-qualified)
+        params_dict: Dictionary of parameter names to values
+
+    Returns:
+        Tuple of (composed SQL with one placeholder per argument, list of
+        parameter values); values are passed to the driver separately
+        instead of being inlined into the SQL text
+    """
+    # Empty inputs are sent as NULL
+    values = [None if value == "" else value for value in params_dict.values()]
+    placeholders = sql.SQL(", ").join([sql.Placeholder()] * len(values))
+    identifier = sql.Identifier(*routine_name.split("."))
+
+    return sql.SQL(template).format(identifier, placeholders), values
@@ -1,9 +1,51 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import streamlit as st
+
 BASE_DIR = Path("database")
 
+# Below this many files, thread start-up costs more than overlapping reads
+PARALLEL_READ_MIN_FILES = 4
+READ_WORKERS = 8
+
+
+def _read_file(entry):
+    return Path(entry.path).read_bytes().decode("utf-8")
+
+
+def _sql_entries(folder):
+    # scandir yields names and file types without an extra stat per file
+    try:
+        with os.scandir(BASE_DIR / folder) as it:
+            return [e for e in it if e.name.endswith(".sql") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+# cache_resource hands back the cached dict itself instead of unpickling
+# a copy on every rerun; callers only read it. Stale snapshots from
+# earlier mtimes are evicted by max_entries.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _read_sql_files(folder, mtime_key):
+    # mtime_key is only part of the cache key (a leading underscore would
+    # make Streamlit skip hashing it)
+    entries = _sql_entries(folder)
+
+    # Issue the reads concurrently so cold-cache latency overlaps
+    if len(entries) < PARALLEL_READ_MIN_FILES:
+        contents = [_read_file(entry) for entry in entries]
+    else:
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+            contents = list(pool.map(_read_file, entries))
+
+    return {entry.name[:-4]: text for entry, text in zip(entries, contents)}
+
+
 def load_sql_files(folder):
-    sql_map = {}
-    for file in (BASE_DIR / folder).glob("*.sql"):
-        sql_map[file.stem] = file.read_text()
-    return sql_map
+    # Re-read from disk only when a file is added, removed or modified
+    mtime_key = tuple(
+        sorted((e.name, e.stat().st_mtime_ns) for e in _sql_entries(folder))
+    )
+    return _read_sql_files(folder, mtime_key)
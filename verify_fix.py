@@ -4,8 +4,12 @@ Quick verification script to test the enhanced error handling in run_query().
 """
 
 from db.executor import run_query
+from functools import lru_cache
 import sys
 
+# Identical test queries within one run are answered from memory
+_cached_run = lru_cache(maxsize=64)(run_query)
+
 
 def test_undefined_function_error():
     """Test that undefined function errors are caught and displayed properly."""
@@ -21,10 +25,10 @@ def test_undefined_function_error():
     """
     
     try:
-        result = run_query(test_query)
+        result = _cached_run(test_query)
         print("✅ Query executed successfully!")
         print(f"   Result shape: {result.shape}")
-        print(f"   Columns: {list(result.columns)}")
+        print(f"   Columns: {result.column_names}")
         return True
     except ValueError as ve:
         # This is expected if function doesn't exist
@@ -52,9 +56,9 @@ def test_simple_query():
     """
     
     try:
-        result = run_query(simple_query)
+        result = _cached_run(simple_query)
         print("✅ Simple query executed successfully!")
-        print(f"   Result: {result.to_dict('records')}")
+        print(f"   Result: {result.to_pylist()}")
         return True
     except Exception as e:
         print(f"❌ Query failed: {e}")